@@ -1 +1,383 @@
-
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+from joblib import Parallel, delayed
+from rdkit import Chem, RDLogger
+from rdkit.Chem import Draw
+from rdkit.ML.Descriptors.MoleculeDescriptors import MolecularDescriptorCalculator
+
+# Invalid SMILES are reported in the results table; the per-parse stderr
+# warnings are just synchronized I/O overhead that Streamlit captures.
+RDLogger.DisableLog("rdApp.*")
+
+st.set_page_config(page_title="ADMET Analyzer", page_icon="🧪", layout="wide")
+
+# One calculator shared by all workers: a single C++ dispatch per molecule
+# instead of four separate Descriptors.* lookups and calls.
+CALC = MolecularDescriptorCalculator(["MolWt", "MolLogP", "NumHDonors", "NumHAcceptors"])
+
+EXAMPLE_DATA = """
+SMILES,Docking_Score
+CC(=O)Oc1ccccc1C(=O)O,-6.2
+CC(C)Cc1ccc(cc1)C(C)C(=O)O,-7.1
+CN1C=NC2=C1C(=O)N(C(=O)N2C)C,-5.8
+C1=CC=C(C=C1)C(=O)O,-4.9
+CC(=O)NC1=CC=C(C=C1)O,-5.4
+CCN(CC)CCNC(=O)C1=CC=C(C=C1)N,-6.8
+C1CCC(CC1)NC2=NC3=CC=CC=C3N2,-7.9
+InvalidSMILES,-5.0
+COc1cc2c(cc1OC)C(=O)C(CC2)Cc3ccn(c3)C,-8.4
+CC(C)(C)NCC(O)c1ccc(O)c(CO)c1,-6.5
+"""
+
+# Parsed once at import time; reruns just take a copy instead of re-reading
+# the CSV text on every interaction.
+EXAMPLE_DF = pd.read_csv(StringIO(EXAMPLE_DATA.strip()))
+
+
+def read_input_csv(buffer):
+    """Read user-supplied CSV with the pyarrow parser and explicit dtypes.
+
+    pyarrow is considerably faster than the default C engine on
+    string-heavy files and keeps the SMILES column out of object dtype.
+    Missing required columns surface as ValueError from pandas or
+    KeyError (ArrowKeyError) from the pyarrow engine.
+    """
+    return pd.read_csv(
+        buffer,
+        engine="pyarrow",
+        usecols=["SMILES", "Docking_Score"],
+        dtype={"SMILES": "string[pyarrow]", "Docking_Score": "float32"},
+    )
+
+
+# Characters that can legally appear in a SMILES string. Anything outside
+# this set (spaces, commas, header fragments...) cannot parse, so we reject
+# it in microseconds instead of paying for an RDKit parse attempt.
+_VALID_SMI = re.compile(r"^[A-Za-z0-9@+\-\[\]\(\)=#/\\%.:$*]+$")
+
+
+@functools.lru_cache(maxsize=100_000)
+def parse_smiles(smiles):
+    """Parse one SMILES to ToBinary() bytes, memoized per string.
+
+    Users typically tweak a row or two and re-analyze; the whole-input
+    cache on compute_results misses then, but every unchanged SMILES still
+    hits this per-string cache. Entries are stored as ToBinary() blobs so
+    they stay compact and picklable. Returns None for strings that fail the
+    charset pre-filter or the RDKit parse.
+    """
+    if not isinstance(smiles, str) or not _VALID_SMI.match(smiles):
+        return None
+    mol = Chem.MolFromSmiles(smiles)
+    return mol.ToBinary() if mol is not None else None
+
+
+def parse_batch(smiles_seq):
+    """Parse a whole batch of SMILES in one threaded pass.
+
+    RDKit's parser releases the GIL, so a thread pool overlaps the C++ work
+    without the pickling cost of a process pool. Returns ToBinary() blobs,
+    with None for entries that fail the charset pre-filter or the parse.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        return list(ex.map(parse_smiles, smiles_seq))
+
+
+def process_row(mol_bin):
+    """Compute the four Lipinski descriptors for one molecule.
+
+    Runs inside a joblib worker, so it must stay a picklable module-level
+    function. ``mol_bin`` is the pre-parsed molecule as ToBinary() bytes
+    (compact and picklable), or None for an invalid SMILES, in which case
+    None is returned. Valid molecules yield a (mw, logp, donors, acceptors)
+    tuple.
+    """
+    if mol_bin is None:
+        return None
+    mw, logp, h_donors, h_acceptors = CALC.CalcDescriptors(Chem.Mol(mol_bin))
+    return round(mw, 2), round(logp, 2), int(h_donors), int(h_acceptors)
+
+
+@st.cache_data(show_spinner=False)
+def compute_results(smiles_tuple, scores_tuple, _n_jobs):
+    """Run the full analysis and return the ranked results DataFrame.
+
+    Streamlit hashes the input tuples, so re-running with identical data is a
+    cache lookup instead of a recompute. ``_n_jobs`` is excluded from the
+    cache key (leading underscore) - it only changes how fast we get the
+    same answer.
+    """
+    mol_bins = parse_batch(smiles_tuple)
+    descriptors = Parallel(n_jobs=_n_jobs, backend="loky")(
+        delayed(process_row)(mol_bin) for mol_bin in mol_bins
+    )
+
+    # Preallocate typed columns and fill by index: no per-row dict churn
+    # and no dtype inference when the frame is assembled. Invalid rows keep
+    # NaN / -1 sentinels, which compare False in the vectorized Lipinski
+    # classification below and are masked out of the final columns.
+    n = len(smiles_tuple)
+    mw_arr = np.full(n, np.nan, dtype=np.float32)
+    logp_arr = np.full(n, np.nan, dtype=np.float32)
+    hd_arr = np.full(n, -1, dtype=np.int8)
+    ha_arr = np.full(n, -1, dtype=np.int8)
+    for i, desc in enumerate(descriptors):
+        if desc is not None:
+            mw_arr[i], logp_arr[i], hd_arr[i], ha_arr[i] = desc
+    valid = ~np.isnan(mw_arr)
+
+    violations = (
+        (mw_arr > 500).astype(np.int8)
+        + (logp_arr > 5)
+        + (hd_arr > 5)
+        + (ha_arr > 10)
+    )
+    df_results = pd.DataFrame(
+        {
+            "SMILES": list(smiles_tuple),
+            "Docking_Score": np.asarray(scores_tuple, dtype=np.float32),
+            "MW": mw_arr,
+            "LogP": logp_arr,
+            # Nullable Int8 so invalid rows display as missing, not -1.
+            "HDonors": pd.arrays.IntegerArray(hd_arr, mask=~valid),
+            "HAcceptors": pd.arrays.IntegerArray(ha_arr, mask=~valid),
+            "Violations": pd.arrays.IntegerArray(violations, mask=~valid),
+            "Status": np.where(
+                valid,
+                np.where(violations <= 1, "Pass", "Fail (Lipinski Violation)"),
+                "Invalid SMILES",
+            ),
+            "ADMET_Predict": np.where(
+                valid,
+                np.where((logp_arr < 5) & (hd_arr <= 5), "Good", "Moderate"),
+                "-",
+            ),
+            # Serialized molecules so later code paths (image rendering)
+            # rehydrate with Chem.Mol() instead of re-parsing the SMILES.
+            "MolBin": mol_bins,
+        }
+    )
+
+    # Rank passing molecules by docking score (more negative binds tighter),
+    # assigning ranks in place rather than splitting, sorting and
+    # re-concatenating three intermediate DataFrames.
+    # A blank score cell reaches us as NaN; rank() would keep it as NaN and
+    # the int cast below would raise, so unscored rows keep the "-" sentinel.
+    mask = df_results["Status"].eq("Pass") & df_results["Docking_Score"].notna()
+    # Explicit object dtype: a bare "-" assignment infers a string dtype on
+    # pandas 3, which then rejects the integer ranks written below.
+    df_results["Final_Rank"] = pd.Series("-", index=df_results.index, dtype=object)
+    df_results.loc[mask, "Final_Rank"] = (
+        df_results.loc[mask, "Docking_Score"]
+        .rank(method="first", ascending=True)
+        .astype(int)
+    )
+    # One stable argsort puts Pass rows first by score and leaves the rest
+    # in input order.
+    sort_key = np.where(
+        mask, df_results["Docking_Score"].to_numpy(dtype=np.float64), np.inf
+    )
+    return df_results.iloc[np.argsort(sort_key, kind="stable")].reset_index(drop=True)
+
+
+@st.cache_data(show_spinner=False)
+def render_structure_grid(mol_bins, legends):
+    """Render one page of structures as a single SVG grid.
+
+    One MolsToGridImage call amortizes the drawing-context setup that a
+    per-molecule loop pays N times over. Molecules arrive as ToBinary()
+    blobs - rehydrating with Chem.Mol(bytes) is an order of magnitude
+    faster than re-parsing SMILES - and the whole grid is memoized per
+    page of input.
+    """
+    mols = [Chem.Mol(mol_bin) for mol_bin in mol_bins]
+    return Draw.MolsToGridImage(
+        mols,
+        molsPerRow=5,
+        subImgSize=(200, 200),
+        legends=list(legends),
+        useSVG=True,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def results_csv(df):
+    """Serialize results straight into a bytes buffer for the download button.
+
+    Writing to BytesIO skips the intermediate Python string plus the
+    .encode() pass, and caching avoids regenerating the export on reruns
+    that don't change the results.
+    """
+    buf = BytesIO()
+    df.to_csv(buf, index=False, lineterminator="\n")
+    return buf.getvalue()
+
+
+st.title("🧪 ADMET & Lipinski Analyzer")
+st.markdown(
+    "Upload docking results (SMILES + docking score) to profile drug-likeness "
+    "with Lipinski's Rule of Five and rank the passing molecules."
+)
+
+st.sidebar.header("Input")
+input_method = st.sidebar.radio(
+    "Input method", ["Upload CSV", "Paste Data", "Use Example Data"]
+)
+
+st.sidebar.header("Performance")
+cpu_count = os.cpu_count() or 1
+if cpu_count > 1:
+    n_jobs = st.sidebar.slider(
+        "Parallel workers (n_jobs)",
+        min_value=1,
+        max_value=cpu_count,
+        value=cpu_count,
+        help="Number of worker processes used to compute descriptors and images.",
+    )
+else:
+    # st.slider rejects min_value == max_value, and there is nothing to
+    # tune on a single-core box anyway.
+    n_jobs = 1
+
+df_input = None
+if input_method == "Upload CSV":
+    uploaded_file = st.file_uploader(
+        "Upload a CSV with SMILES and Docking_Score columns", type=["csv"]
+    )
+    if uploaded_file is not None:
+        try:
+            df_input = read_input_csv(uploaded_file)
+        except (ValueError, KeyError):
+            st.error("The CSV must contain SMILES and Docking_Score columns.")
+            st.stop()
+elif input_method == "Paste Data":
+    pasted = st.text_area(
+        "Paste CSV data (header row: SMILES,Docking_Score)",
+        height=160,
+        placeholder="SMILES,Docking_Score\nCC(=O)Oc1ccccc1C(=O)O,-6.2",
+    )
+    if pasted.strip():
+        try:
+            df_input = read_input_csv(StringIO(pasted))
+        except (ValueError, KeyError):
+            st.error("The pasted data must contain SMILES and Docking_Score columns.")
+            st.stop()
+else:
+    # Copy so downstream code can't mutate the module-level frame.
+    df_input = EXAMPLE_DF.copy()
+
+if df_input is not None:
+    missing = {"SMILES", "Docking_Score"} - set(df_input.columns)
+    if missing:
+        st.error(f"Input is missing required column(s): {', '.join(sorted(missing))}")
+        st.stop()
+
+    st.subheader("Input Data")
+    st.dataframe(df_input, use_container_width=True)
+
+    if st.button("Analyze", type="primary"):
+        st.session_state["run_analysis"] = True
+
+    if st.session_state.get("run_analysis"):
+        with st.spinner("Computing descriptors..."):
+            df_final = compute_results(
+                tuple(df_input["SMILES"]),
+                tuple(df_input["Docking_Score"]),
+                n_jobs,
+            )
+
+        # Status only takes three values, so the Lipinski-fail count falls
+        # out by subtraction - no need to regex-scan the column.
+        pass_count = int((df_final["Status"] == "Pass").sum())
+        invalid_count = int((df_final["Status"] == "Invalid SMILES").sum())
+        fail_count = len(df_final) - pass_count - invalid_count
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Molecules", len(df_final))
+        col2.metric("Lipinski Pass", pass_count)
+        col3.metric("Lipinski Fail", fail_count)
+        col4.metric("Invalid SMILES", invalid_count)
+
+        df_display = df_final.drop(columns=["MolBin"])
+        st.subheader("Results")
+        st.dataframe(df_display, use_container_width=True)
+
+        st.subheader("Charts")
+        # Downcast before handing the frame to Plotly: float64/object columns
+        # bloat the JSON payload shipped to the browser.
+        df_pass_plot = df_display[df_display["Status"] == "Pass"].astype(
+            {
+                "MW": "float32",
+                "LogP": "float32",
+                "HDonors": "int8",
+                "HAcceptors": "int8",
+                "Violations": "int8",
+                "Status": "category",
+                "ADMET_Predict": "category",
+            }
+        )
+        if not df_pass_plot.empty:
+            fig_scatter = px.scatter(
+                df_pass_plot,
+                x="MW",
+                y="LogP",
+                color="ADMET_Predict",
+                hover_data=["SMILES", "Docking_Score"],
+                title="Molecular Weight vs LogP (Lipinski Pass)",
+            )
+            st.plotly_chart(fig_scatter, use_container_width=True)
+
+            fig_bar = px.bar(
+                df_pass_plot.sort_values("Docking_Score"),
+                x="Final_Rank",
+                y="Docking_Score",
+                hover_data=["SMILES"],
+                title="Docking Score by Final Rank",
+            )
+            st.plotly_chart(fig_bar, use_container_width=True)
+        else:
+            st.info("No molecules passed the Lipinski filter - charts skipped.")
+
+        st.subheader("Molecular Structures")
+        # Depictions are the slowest per-row step, so only render what the
+        # user actually asks to see.
+        if st.checkbox("Show structures"):
+            # A header-only upload gives zero rows, and st.slider rejects
+            # min == max bounds.
+            if df_final.empty:
+                st.info("No molecules to display.")
+            else:
+                row_start, row_end = st.slider(
+                    "Show rows", 0, len(df_final), (0, min(20, len(df_final)))
+                )
+                df_page = df_final.iloc[row_start:row_end]
+                # Pull the legend fields out once; .iloc per image would
+                # build a throwaway Series for every lookup.
+                smiles_arr = df_page["SMILES"].to_numpy()
+                score_arr = df_page["Docking_Score"].to_numpy()
+                mol_bins = []
+                legends = []
+                for i, mol_bin in enumerate(df_page["MolBin"]):
+                    if mol_bin is not None:
+                        mol_bins.append(mol_bin)
+                        legends.append(f"{smiles_arr[i]} | Score: {score_arr[i]}")
+                if mol_bins:
+                    grid_svg = render_structure_grid(tuple(mol_bins), tuple(legends))
+                    st.markdown(grid_svg, unsafe_allow_html=True)
+                else:
+                    st.info("No valid molecules in the selected rows.")
+
+        st.download_button(
+            "Download Results CSV",
+            data=results_csv(df_display),
+            file_name="admet_results.csv",
+            mime="text/csv",
+        )
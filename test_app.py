@@ -0,0 +1,37 @@
+"""Smoke tests for the analysis pipeline behind the Streamlit UI.
+
+Importing app executes the script top to bottom; outside a Streamlit
+runtime the st.* calls are no-ops, so only the module-level setup runs.
+"""
+
+from app import compute_results
+
+
+def test_compute_results_ranks_and_flags():
+    smiles = ("CC(=O)Oc1ccccc1C(=O)O", "InvalidSMILES", "CCO")
+    scores = (-6.2, -5.0, -4.9)
+
+    df_final = compute_results(smiles, scores, 1)
+
+    assert len(df_final) == 3
+    assert list(df_final["Status"]).count("Pass") == 2
+    # Pass rows come first, ranked by docking score (most negative first).
+    assert list(df_final.loc[df_final["Status"] == "Pass", "Final_Rank"]) == [1, 2]
+    assert list(df_final.loc[df_final["Status"] == "Pass", "SMILES"]) == [
+        "CC(=O)Oc1ccccc1C(=O)O",
+        "CCO",
+    ]
+    # Invalid rows keep the sentinel rank and missing descriptors.
+    invalid = df_final[df_final["Status"] == "Invalid SMILES"]
+    assert len(invalid) == 1
+    assert (invalid["Final_Rank"] == "-").all()
+    assert invalid["MW"].isna().all()
+
+
+def test_compute_results_handles_missing_docking_score():
+    df_final = compute_results(("CCO", "CCN"), (float("nan"), -4.9), 1)
+
+    assert (df_final["Status"] == "Pass").all()
+    # The scored molecule is ranked; the unscored one keeps the sentinel.
+    assert list(df_final["Final_Rank"]) == [1, "-"]
+    assert df_final.loc[df_final["Final_Rank"] == 1, "SMILES"].item() == "CCN"